@@ -1,9 +1,12 @@
+import io
 import logging
 
 from abc import ABC, abstractmethod
+from contextlib import nullcontext
 
 import psycopg2
 import cx_Oracle
+from psycopg2.errors import DeadlockDetected, SerializationFailure
 from psycopg2.extras import execute_values
 
 from db.oracle_query_builder import OracleQueryBuilder
@@ -11,6 +14,11 @@ from db.postgres_query_builder import PostgresQueryBuilder
 
 
 class ConnectionManager(ABC):
+    supports_copy = False  # Whether execute_batch_copy is available for bulk loads
+    # Driver exceptions worth retrying on the same connection (deadlocks, serialization failures).
+    # Lost connections are not included: the savepoint rollback would fail on them too.
+    transient_errors = ()
+
     def __init__(self, db_config):
         """
         Initialize with database configuration.
@@ -39,14 +47,56 @@ class ConnectionManager(ABC):
         pass
 
     @abstractmethod
-    def execute_batch_insert(self, conn, query, values):
+    def execute_batch_insert(self, conn, query, values, cursor=None, commit=True):
         """
         Executes a batch insert operation. Must be implemented in subclass.
+
+        When `cursor` is given it is used and left open, otherwise a cursor is opened for the call.
+        With `commit=False` the rows stay in the caller's open transaction.
         """
         pass
 
+    def execute_batch_copy(self, conn, query, values, cursor=None, commit=True):
+        """
+        Bulk-loads rows with the database's COPY mechanism. Only available when `supports_copy` is set.
+        """
+        raise NotImplementedError("execute_batch_copy is not supported by this connection manager.")
+
+    def savepoint(self, cursor, name):
+        """
+        Marks a savepoint in the current transaction.
+
+        Args:
+            cursor: Cursor of the connection holding the transaction.
+            name (str): Savepoint name.
+        """
+        cursor.execute(f"SAVEPOINT {name}")
+
+    def release_savepoint(self, cursor, name):
+        """
+        Releases a savepoint once the work after it has succeeded.
+
+        Args:
+            cursor: Cursor of the connection holding the transaction.
+            name (str): Savepoint name.
+        """
+        cursor.execute(f"RELEASE SAVEPOINT {name}")
+
+    def rollback_to_savepoint(self, cursor, name):
+        """
+        Undoes the work done since a savepoint, keeping the rest of the transaction.
+
+        Args:
+            cursor: Cursor of the connection holding the transaction.
+            name (str): Savepoint name.
+        """
+        cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+
 
 class PostgresConnectionManager(ConnectionManager):
+    supports_copy = True
+    transient_errors = (DeadlockDetected, SerializationFailure)
+
     def __init__(self, db_config, schema=None):
         super().__init__(db_config)
         self.query_builder = PostgresQueryBuilder(db_config["consumerConfig"]["table_name"])
@@ -79,16 +129,46 @@ class PostgresConnectionManager(ConnectionManager):
         self.query_builder = PostgresQueryBuilder(table_name)
         return self.query_builder
 
-    def execute_batch_insert(self, conn, query, values):
+    def execute_batch_insert(self, conn, query, values, cursor=None, commit=True, page_size=None):
         """
         Executes a batch insert operation using `execute_values` for PostgreSQL.
+
+        An explicit row template spares psycopg2 from deriving the placeholders itself, and by
+        default the whole batch is packed into a single INSERT statement (one round trip).
+        `page_size` caps the rows per statement instead.
         """
-        with conn.cursor() as cur:
-            execute_values(cur, query, values)
-            conn.commit()
+        template = f"({', '.join(['%s'] * len(values[0]))})" if values else None
+        with _cursor_scope(conn, cursor) as cur:
+            execute_values(cur, query, values, template=template, page_size=page_size or len(values) or 1)
+            if commit:
+                conn.commit()
             logging.info(f"Successfully inserted {len(values)} records into PostgreSQL.")
 
+    def execute_batch_copy(self, conn, query, values, cursor=None, commit=True):
+        """
+        Bulk-loads rows with COPY ... FROM STDIN using the tab-separated text format.
+
+        NULLs are written as \\N and backslashes, tabs and line breaks inside values are escaped,
+        so empty strings stay distinct from NULLs.
+        """
+        buffer = io.StringIO()
+        for row in values:
+            buffer.write("\t".join(map(_copy_text_field, row)))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        with _cursor_scope(conn, cursor) as cur:
+            cur.copy_expert(query, buffer)
+            if commit:
+                conn.commit()
+            logging.info(f"Successfully copied {len(values)} records into PostgreSQL.")
+
+
 class OracleConnectionManager(ConnectionManager):
+    # cx_Oracle reports deadlocks (ORA-00060) and serialization failures (ORA-08177) only as a
+    # generic DatabaseError code, so there is no exception class to retry on
+    transient_errors = ()
+
     def __init__(self, db_config):
         super().__init__(db_config)
         self.query_builder = OracleQueryBuilder(db_config["consumerConfig"]["table_name"])
@@ -123,11 +203,56 @@ class OracleConnectionManager(ConnectionManager):
         self.query_builder = OracleQueryBuilder(table_name)
         return self.query_builder
 
-    def execute_batch_insert(self, conn, query, values):
+    def release_savepoint(self, cursor, name):
+        """
+        Oracle has no RELEASE SAVEPOINT; savepoints simply end with the transaction.
+        """
+        pass
+
+    def execute_batch_insert(self, conn, query, values, cursor=None, commit=True):
         """
         Executes a batch insert operation using `executemany` for Oracle.
         """
-        with conn.cursor() as cur:
+        with _cursor_scope(conn, cursor) as cur:
             cur.executemany(query, values)  # Oracle's batch execution
-            conn.commit()
+            if commit:
+                conn.commit()
             logging.info(f"Successfully inserted {len(values)} records into Oracle.")
+
+
+def _cursor_scope(conn, cursor):
+    """
+    Returns a context manager yielding the cursor to run a statement on.
+
+    Args:
+        conn: The database connection.
+        cursor: A caller-owned cursor to reuse, or None.
+
+    Returns:
+        The caller's cursor wrapped so it stays open, or a new cursor that is closed on exit.
+    """
+    if cursor is not None:
+        return nullcontext(cursor)
+    return conn.cursor()
+
+
+def _copy_text_field(value):
+    """
+    Formats a single value as a COPY text-format field.
+
+    Args:
+        value: The value to format.
+
+    Returns:
+        str: \\N for None, otherwise the value with backslashes, tabs and line breaks escaped.
+    """
+    if value is None:
+        return "\\N"
+    # Chained replace() beats str.translate() here, since most values need no escaping at all
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
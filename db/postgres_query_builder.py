@@ -40,6 +40,19 @@ class PostgresQueryBuilder(QueryBuilder):
         # Generate the query
         return f"INSERT INTO {self.table_name} ({col_list}) VALUES {values_placeholder} RETURNING id;"
 
+    def build_copy_query(self, columns):
+        """
+        Generate a COPY ... FROM STDIN query that bulk-loads tab-separated text rows into the table.
+
+        Args:
+            columns (list): List of column names, in the order the fields are written.
+
+        Returns:
+            str: A SQL COPY query string.
+        """
+        col_list = ", ".join(f'"{col.lower()}"' for col in columns)
+        return f"COPY {self.table_name} ({col_list}) FROM STDIN WITH (FORMAT text)"
+
     def build_update_query(self, columns, condition="id = %s"):
         assignments = ", ".join(f'"{col.lower()}" = %s' for col in columns if col != "job_id")
         return f"UPDATE {self.table_name} SET {assignments} WHERE {condition}"
@@ -9,6 +9,9 @@ class QueryBuilder:
     def build_update_query(self, columns, condition="id = :id"):
         raise NotImplementedError("build_update_query must be implemented in subclasses.")
 
+    def build_copy_query(self, columns):
+        raise NotImplementedError("build_copy_query must be implemented in subclasses.")
+
     def set_schema(self, schema):
         """
         Updates the schema for the query builder.
@@ -113,7 +113,7 @@ class FileProcessor(Processor):
             producer=producer,
             connection_manager=self.connection_manager,
             key_column_mapping=schema,
-            batch_size=5
+            batch_size=1000
         )
 
         return producer, consumer, schema
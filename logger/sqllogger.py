@@ -1,21 +1,39 @@
+import atexit
 import logging
-import datetime
 import json
+import queue
 import socket
 
 import logging.handlers
 import uuid
+import weakref
+from threading import Lock, Thread
 
 from prometheus_client import Counter, Histogram
 
 from logger.logger import Logger
 from errors.error_resolver import ErrorResolver
+from logger.timeutil import now_iso
 
 # Prometheus metrics for observability
 LOG_DB_WRITE_SUCCESS = Counter("log_db_write_success", "Number of successful DB writes")
 LOG_DB_WRITE_FAILURE = Counter("log_db_write_failure", "Number of failed DB writes")
 LOG_PROCESSING_TIME = Histogram("log_processing_time_seconds", "Time taken to process logs")
 
+# Loggers not yet closed. They are held weakly so that being closed at exit doesn't keep them alive.
+_open_loggers = weakref.WeakSet()
+
+
+def _close_open_loggers():
+    """
+    Closes every SQLLogger still open at interpreter exit, so their queued job updates are written.
+    """
+    for sql_logger in list(_open_loggers):
+        sql_logger.close()
+
+
+atexit.register(_close_open_loggers)
+
 
 def setup_fallback_logger():
     """
@@ -77,11 +95,17 @@ class SQLLogger(Logger):
     """
     Handles database logging operations with fallback mechanisms for error resilience.
 
+    New job entries are inserted synchronously since callers need the returned job ID. Updates
+    to existing entries are queued and written by a background thread in batches, one commit
+    per batch, so they stay off the caller's critical path.
+
     Attributes:
         connection_manager (DBConnectionManager): Manages database connections.
         context (LoggerContext): Provides contextual information for logging operations.
     """
 
+    UPDATE_BATCH_SIZE = 500  # Queued job updates written per commit by the writer thread
+
     def __init__(self, connection_manager, context):
         super().__init__()
         self.connection_manager = connection_manager
@@ -92,6 +116,18 @@ class SQLLogger(Logger):
         self.error_resolver = ErrorResolver(self.conn, context.error_table)
         self.fallback_logger = setup_fallback_logger()
         # self.ctx_id = uuid.uuid4().hex
+        self._db_lock = Lock()  # Callers and the writer thread share self.conn (and the error resolver's queries)
+        self._updates = queue.SimpleQueue()
+        self._closed = False
+        self._close_lock = Lock()  # Keeps an update from being queued behind the writer's stop sentinel
+        # The writer only holds the logger weakly, and is stopped once the logger is collected
+        self._writer = Thread(
+            target=self._write_updates_loop, args=(weakref.ref(self), self._updates),
+            name="sql-logger-writer", daemon=True)
+        self._writer.start()
+        weakref.finalize(self, self._updates.put, None).atexit = False
+        # Nothing else is guaranteed to close the logger, so make sure queued updates are written on exit
+        _open_loggers.add(self)
         logging.debug("SQLLogger initialized successfully.")
 
     def _build_parameters(self, **kwargs):
@@ -112,7 +148,8 @@ class SQLLogger(Logger):
             if key in kwargs:
                 parameters[db_column] = kwargs[key]
 
-        logging.info(f"Constructed parameters: {parameters}")
+        # Lazily formatted at DEBUG, since the parameters may carry a batch's values
+        logging.debug("Constructed parameters: %s", parameters)
         return parameters
 
     def log_job(self, *args, symbol, **kwargs):
@@ -130,29 +167,29 @@ class SQLLogger(Logger):
         Raises:
             Exception: Logs errors and triggers fallback logging on failure.
         """
-        try:
-            severity, message = self.error_resolver.resolve(symbol, *args)
-            current_time = datetime.datetime.now(datetime.timezone.utc).isoformat()
-            host_name = socket.gethostname()
-
-            job_id = kwargs.get("job_id")
+        job_id = kwargs.get("job_id")
+        if job_id is not None:
+            # Update operation: the caller already has the job ID, so the writer thread handles it.
+            # The context ID is captured now, since the producer may have moved on to another file
+            # by the time the update is written.
+            ctx_id = self.get_context_id()
+            with self._close_lock:
+                closed = self._closed
+                if not closed:
+                    self._updates.put((args, symbol, kwargs, ctx_id))
+            if closed:
+                # The writer has stopped (e.g. a daemon thread logging during exit); keep the entry
+                # in the fallback log instead of failing the caller's error path
+                self._fallback_log(symbol, "SQLLogger is closed", kwargs, ctx_id)
+            return job_id
 
-            if job_id is None:
-                # Insert operation
-                insert_params = self._build_parameters(
-                    symbol=symbol, severity=severity, message=message, host_name=host_name, ctx_id=self.get_context_id(), **kwargs
-                )
+        try:
+            # Insert operation
+            with self._db_lock:
+                insert_params = self._job_parameters(args, symbol, kwargs, self.get_context_id())
                 insert_query = self.query_builder.build_insert_query(insert_params.keys(), batch=False)
                 # logging.info(f"Inserting {symbol} into {host_name} table...\nINSERT QUERY: {insert_query}")
                 job_id = self._execute_query(insert_query, tuple(insert_params.values()))
-            else:
-                # Update operation
-                update_params = self._build_parameters(
-                    symbol=symbol, severity=severity, message=message, host_name=host_name, ctx_id=self.get_context_id(), **kwargs
-                )
-                update_query = self.query_builder.build_update_query(update_params.keys())
-                # logging.info(f"Updating {symbol} into {host_name} table...\nUPDATE QUERY: {update_query}")
-                self._execute_query(update_query, tuple(update_params.values()) + (job_id,))
 
             LOG_DB_WRITE_SUCCESS.inc()
             return job_id
@@ -161,6 +198,85 @@ class SQLLogger(Logger):
             logging.error(f"Failed to log job: {e}")
             self._fallback_log(symbol, str(e), kwargs)
 
+    def _job_parameters(self, args, symbol, kwargs, ctx_id):
+        """
+        Resolves the symbol and builds the column parameters of a job entry.
+
+        Must be called while holding the DB lock, since the error resolver queries the shared connection.
+
+        Args:
+            args (tuple): Positional arguments for the error resolver.
+            symbol (str): Unique identifier for the log type.
+            kwargs (dict): Metadata fields for the log.
+            ctx_id (str): Context ID current when the entry was logged.
+
+        Returns:
+            dict: Parameters keyed by database column.
+        """
+        severity, message = self.error_resolver.resolve(symbol, *args)
+        host_name = socket.gethostname()
+        return self._build_parameters(
+            symbol=symbol, severity=severity, message=message, host_name=host_name, ctx_id=ctx_id, **kwargs
+        )
+
+    @classmethod
+    def _write_updates_loop(cls, logger_ref, updates):
+        """
+        Writes queued job updates until the stop sentinel arrives, taking up to
+        UPDATE_BATCH_SIZE entries at a time.
+
+        Args:
+            logger_ref (weakref.ref): Weak reference to the logger the updates belong to.
+            updates (queue.SimpleQueue): The logger's queue of (args, symbol, kwargs, ctx_id) updates.
+        """
+        while True:
+            entry = updates.get()
+            if entry is None:
+                return
+
+            entries = [entry]
+            stop = False
+            while len(entries) < cls.UPDATE_BATCH_SIZE:
+                try:
+                    entry = updates.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                entries.append(entry)
+
+            sql_logger = logger_ref()
+            if sql_logger is None:
+                return
+            sql_logger._write_updates(entries)
+            del sql_logger  # Don't keep the logger alive while waiting for the next update
+            if stop:
+                return
+
+    def _write_updates(self, entries):
+        """
+        Applies a batch of job updates in one transaction, falling back to the file logger on failure.
+
+        Args:
+            entries (list[tuple]): Queued (args, symbol, kwargs, ctx_id) updates.
+        """
+        with self._db_lock:
+            try:
+                with self.conn.cursor() as cursor:
+                    for args, symbol, kwargs, ctx_id in entries:
+                        update_params = self._job_parameters(args, symbol, kwargs, ctx_id)
+                        update_query = self.query_builder.build_update_query(update_params.keys())
+                        cursor.execute(update_query, tuple(update_params.values()) + (kwargs["job_id"],))
+                self.conn.commit()
+                LOG_DB_WRITE_SUCCESS.inc(len(entries))
+            except Exception as e:
+                self.conn.rollback()
+                LOG_DB_WRITE_FAILURE.inc(len(entries))
+                logging.error(f"Failed to log {len(entries)} job updates: {e}")
+                for _, symbol, kwargs, ctx_id in entries:
+                    self._fallback_log(symbol, str(e), kwargs, ctx_id)
+
     def _execute_query(self, query, parameters):
         """
         Executes an SQL query using a connection-level cursor.
@@ -178,17 +294,18 @@ class SQLLogger(Logger):
         try:
             with self.conn.cursor() as cursor:
                 cursor.execute(query, parameters)
-                if query.strip().lower().startswith("insert"):
-                    return cursor.fetchone()[0]
+                result = cursor.fetchone()[0] if query.strip().lower().startswith("insert") else None
 
-                self.conn.commit()
+            # Commit inserts too, so a rolled-back batch of updates cannot take new entries with it
+            self.conn.commit()
+            return result
             # logging.info(f"Successfully executed query: {query}")
         except Exception as e:
             logging.error(f"Error executing query: {query}, Parameters: {parameters}, Error: {e}")
             self.conn.rollback()
             raise
 
-    def _fallback_log(self, symbol, message, kwargs):
+    def _fallback_log(self, symbol, message, kwargs, ctx_id=None):
         """
         Logs job details to the fallback logger in case of a database failure.
 
@@ -196,8 +313,10 @@ class SQLLogger(Logger):
             symbol (str): Unique identifier for the log type.
             message (str): Error message to log.
             kwargs: Additional metadata fields for the log.
+            ctx_id (str, optional): Context ID of the entry; defaults to the current one.
         """
         log_entry = self._format_log_entry(
+            ctx_id=ctx_id,
             symbol=symbol,
             message=message,
             additional_info=kwargs,
@@ -205,7 +324,7 @@ class SQLLogger(Logger):
         logging.warning(f"Fallback log entry: {log_entry}")
         self.fallback_logger.info(log_entry)
 
-    def _format_log_entry(self, **kwargs):
+    def _format_log_entry(self, ctx_id=None, **kwargs):
         """
         Formats a log entry as a structured JSON object.
 
@@ -213,6 +332,7 @@ class SQLLogger(Logger):
         hostname, and context details. Additional fields can be appended via keyword arguments.
 
         Args:
+            ctx_id (str, optional): Context ID of the entry; defaults to the current one.
             **kwargs: Additional fields to include in the log entry, such as error details,
                       database query, or processing context.
 
@@ -225,10 +345,10 @@ class SQLLogger(Logger):
         try:
             # Construct the core log entry structure
             log_entry = {
-                "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),  # ISO8601 format for timestamp
+                "timestamp": now_iso(),  # ISO8601 format for timestamp
                 "host": socket.gethostname(),  # Hostname of the machine running the logger
                 "context": {
-                    "id": self.get_context_id(),
+                    "id": ctx_id if ctx_id is not None else self.get_context_id(),
                     "interface_type": self.context.interface_type,  # Name of interface were logging for
                     "user_id": self.context.user_id,  # User associated with the log entry
                     "table_name": self.context.table_name,  # Primary table related to the log
@@ -246,10 +366,18 @@ class SQLLogger(Logger):
 
     def close(self):
         """
-        Closes the database connection when the logger is no longer in use.
+        Writes any queued job updates, then closes the database connection when the logger is no longer in use.
+        Updates logged after this go to the fallback log, since the writer has stopped.
         """
+        _open_loggers.discard(self)
+        with self._close_lock:
+            self._closed = True
+            if self._writer.is_alive():
+                self._updates.put(None)
+        self._writer.join()
         if self.conn:
             self.conn.close()
+            self.conn = None
             logging.info("SQL Logger connection closed.")
 
     def set_context_id(self, context_id):
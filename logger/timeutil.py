@@ -0,0 +1,24 @@
+import datetime
+import time
+
+# (monotonic millisecond, ISO timestamp) of the last now_iso() call
+_now_iso_cache = (None, None)
+
+
+def now_iso():
+    """
+    Return the current UTC time as an ISO 8601 string.
+
+    Calls within the same millisecond share one formatted string, so the several job-log
+    timestamps written around each batch do not each pay for datetime.now() and isoformat().
+
+    Returns:
+        str: The current UTC time in ISO 8601 format.
+    """
+    global _now_iso_cache
+    tick = time.monotonic_ns() // 1_000_000
+    cached_tick, timestamp = _now_iso_cache
+    if tick != cached_tick:
+        timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        _now_iso_cache = (tick, timestamp)
+    return timestamp
@@ -191,7 +191,7 @@ def main():
         producer = ProducerFactory.create_producer(interface_id, **config["producerConfig"])
 
         # Update the consumerConfig to reference the created producer and logger. Each key is a parameter in the respective Consumer subclass.
-        # For example: SQLConsumer(logger, table_name, producer, connection_manager, key_column_mapping, batch_size=5)
+        # For example: SQLConsumer(logger, table_name, producer, connection_manager, key_column_mapping, batch_size=1000)
         config["consumerConfig"].update({"producer": producer})
         config["consumerConfig"].update({"logger": processor.logger})
         config["consumerConfig"].update({"connection_manager": DBConnectionFactory.get_connection_manager(config['dbType'], config)
@@ -29,7 +29,7 @@ class ConsumerFactory:
         Raises:
             ValueError: If the interface ID is not registered.
         """
-        if interface_id not in cls._registry:
+        consumer_class = cls._registry.get(interface_id)
+        if consumer_class is None:
             raise ValueError(f"Consumer for interface '{interface_id}' not registered.")
-        consumer_class = cls._registry[interface_id]
         return consumer_class(*args, **kwargs)
@@ -1,9 +1,10 @@
-import datetime
 import logging
-import json
-from config.config import METRICS, FILE_DELIMITER
+from operator import itemgetter
+from config.config import METRICS
+from msgbroker.file_marker import FileMarker
+from logger.timeutil import now_iso
 from msgbroker.producer_consumer import Consumer
-from threading import Lock
+from transformations.transformation import Transformation
 from psycopg2.extras import execute_values  # Efficient bulk insert for PostgreSQL
 
 class ExcelConsumer(Consumer):
@@ -14,16 +15,19 @@ class ExcelConsumer(Consumer):
 
         Args:
             producer (ExcelProducer): The producer instance providing records.
+            transformation (Transformation | list): Transformation applied to each record, or a list
+                of transformations fused into one with Transformation.compose().
             output_file (str): Path to the output CSV file.
         """
         super().__init__(producer)
         self.global_context = global_context
+        if isinstance(transformation, (list, tuple)):
+            transformation = Transformation.compose(transformation)
         self.transformation = transformation
         self.connection_manager = connection_manager
         self.logger = logger
         self.consumed_records = []
-        self.batch = []
-        self.lock = Lock()
+        self.batch = []  # Owned by the consume() thread only, so it needs no lock
         self.conn = self.connection_manager.connect()
         self.query_builder = self.connection_manager.get_query_builder("") # Get QueryBuilder from the connection manager
         self.error = False
@@ -31,6 +35,8 @@ class ExcelConsumer(Consumer):
         self.table_name = None
         self.column_names = None
         self.query_builder = None
+        self._cached_query = None  # INSERT query for the current file's table and columns
+        self._row_getter = None  # Pulls the current file's columns out of a record in one C call
 
     def consume(self):
         """
@@ -40,11 +46,12 @@ class ExcelConsumer(Consumer):
             symbol="GS2001W",
             job_name=f"Consume Records for {self.producer.file_path}",
             artifact_name=self.producer.file_path,
-            start_time=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            start_time=now_iso(),
             success=False,
             status="IN PROGRESS"
         )
 
+        transform = self.transformation.transform  # Resolved once, not per record
         try:
             while True:
                 record = self.producer.consume()
@@ -55,17 +62,22 @@ class ExcelConsumer(Consumer):
 
                 # Handle file delimiter marker to ensure we handle any remaining records before moving to the next file,
                 # and prevent any side effects with mismatched table name and columns.
-                if "marker" in record and record["marker"] == FILE_DELIMITER:
+                if record.__class__ is FileMarker:
                     if self.batch:
                         self._insert_batch()  # Ensure previous batch is committed
 
+                    record.apply(self.global_context)
+
                     self.table_name = self.global_context.get("table_name")
                     self.column_names = self.global_context.get("column_names")
                     self.query_builder = self.connection_manager.get_query_builder(self.table_name)
+                    self.transformation.refresh()  # Pick up the new file's context
+                    self._cached_query = None  # Rebuilt for the new table and columns on the next insert
+                    self._row_getter = None
                     logging.info(f"Switching to new file: Table={self.table_name}, Columns={self.column_names}")
                     continue  # Skip marker and move to next record
 
-                self.batch.append(self.transformation.transform(record))
+                self.batch.append(transform(record))
                 if len(self.batch) >= self.batch_size:
                     self._insert_batch()
 
@@ -75,7 +87,7 @@ class ExcelConsumer(Consumer):
                 job_name=f"Consume Records for {self.producer.file_path}",
                 artifact_name=self.producer.file_path,
                 error_message=str(e),
-                end_time=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                end_time=now_iso(),
                 job_id=job_id,
                 success=False,
                 status="ERROR"
@@ -94,7 +106,7 @@ class ExcelConsumer(Consumer):
                 artifact_name=self.producer.file_path,
                 job_id=job_id,
                 success=not self.error,
-                end_time=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                end_time=now_iso(),
                 status="COMPLETED"
             )
 
@@ -106,21 +118,24 @@ class ExcelConsumer(Consumer):
             return
 
         try:
-            query = self.query_builder.build_insert_query(self.column_names)
-            values = [[record.get(col, None) for col in self.column_names] for record in self.batch]
+            # Table and columns only change at a file marker, so build the query once per file
+            if self._cached_query is None:
+                self._cached_query = self.query_builder.build_insert_query(self.column_names)
+                self._row_getter = itemgetter(*self.column_names)
+            query = self._cached_query
+            values = self._build_values()
 
             job_id = self.logger.log_job(
                 query=query,
-                values=json.dumps(values),
                 symbol="GS2001W",
                 job_name=f"Batch Insert for {self.producer.file_path}",
                 artifact_name=self.producer.file_path,
                 success=True,
                 status="SUCCESS",
-                end_time=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                end_time=now_iso(),
             )
 
-            logging.info("Values in batch: %s", values)
+            logging.debug("Values in batch: %s", values)
             logging.info("Insert query: %s", query)
 
             try:
@@ -130,14 +145,13 @@ class ExcelConsumer(Consumer):
 
                 self.logger.log_job(
                     query=query,
-                    values=json.dumps(values),
                     symbol="GS2001W",
                     job_name=f"Batch Insert for {self.producer.file_path}",
                     artifact_name=self.producer.file_path,
                     job_id=job_id,
                     success=True,
                     status="SUCCESS",
-                    end_time=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    end_time=now_iso(),
                 )
 
                 METRICS["records_processed"].inc(len(self.batch))
@@ -148,6 +162,22 @@ class ExcelConsumer(Consumer):
             self.error = True
             raise
 
+    def _build_values(self):
+        """
+        Extracts the current file's column values from every record in the batch.
+
+        Returns:
+            list[tuple]: One tuple of column values per record, with None for missing columns.
+        """
+        try:
+            if len(self.column_names) == 1:
+                # With a single column itemgetter returns the bare value, so wrap it in a tuple
+                return [(self._row_getter(record),) for record in self.batch]
+            return list(map(self._row_getter, self.batch))
+        except KeyError:
+            # Some record lacks a column; fall back to per-key lookups that fill in None
+            return [tuple(map(record.get, self.column_names)) for record in self.batch]
+
     def process_record(self, record):
         """
         Process an individual record by adding it to the consumed records list.
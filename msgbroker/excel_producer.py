@@ -1,12 +1,12 @@
 import uuid
 
-from config.config import FILE_DELIMITER
+from msgbroker.file_marker import FileMarker
 from msgbroker.producer_consumer import Producer
+from msgbroker.spsc_queue import SPSCQueue
 
 import os
 import logging
 import pandas as pd
-from queue import Queue
 
 class ExcelProducer(Producer):
 
@@ -28,7 +28,7 @@ class ExcelProducer(Producer):
         super().__init__(logger, **kwargs)
         self.global_context = global_context
         self.config = config
-        self.queue = Queue(maxsize=maxsize)
+        self.queue = SPSCQueue(maxsize=maxsize)  # One producer thread feeds one consumer thread
         self.file_path = file_path
 
     def produce_from_source(self):
@@ -57,12 +57,13 @@ class ExcelProducer(Producer):
                 logging.info(
                     f"Processing file: {file} with Context ID: {self.logger.get_context_id()}")
 
-                self.global_context.set("table_name", table_name)
-                self.global_context.set("column_names", column_names)
-                self.global_context.set("filename", file.split("/")[-1])
-                self.global_context.set("context_id", context_id)
-                # Notify consumer of new file
-                self.produce({"marker": FILE_DELIMITER})
+                # Notify consumer of new file; it applies the file's context when it gets here
+                self.produce(FileMarker(
+                    table_name=table_name,
+                    column_names=column_names,
+                    filename=os.path.basename(file),
+                    context_id=context_id,
+                ))
 
                 for _, record in data.iterrows():
                     self.produce(record.to_dict())  # Push each row individually
@@ -0,0 +1,35 @@
+class FileMarker:
+    """
+    Queued ahead of each file's records to tell the consumer that a new file starts.
+
+    The marker carries the file's context (e.g. key_column_mapping, filename, context_id), and the
+    consumer copies it into the global context when it reaches the marker. The producer may
+    already be reading a later file by then, so the values must travel with the marker rather
+    than be read from the shared context.
+
+    Consumers detect markers with `record.__class__ is FileMarker`, a pointer comparison that
+    keeps the check off the per-record cost of plain dict records.
+    """
+    __slots__ = ("context",)
+
+    def __init__(self, **context):
+        """
+        Initialize the marker.
+
+        Args:
+            **context: Global context values describing the file that follows.
+        """
+        self.context = context
+
+    def apply(self, global_context):
+        """
+        Copies the marker's values into the global context.
+
+        Args:
+            global_context (GlobalContext): Context shared with the consumer's transformations.
+        """
+        for key, value in self.context.items():
+            global_context.set(key, value)
+
+    def __repr__(self):
+        return f"FileMarker({self.context!r})"
@@ -1,12 +1,110 @@
 import json
 import logging
+import mmap
+import multiprocessing
 import os
+import queue
+import sys
 import uuid
-from queue import Queue
-import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from threading import Event
 
-from config.config import METRICS, FILE_DELIMITER
+from config.config import METRICS
+from msgbroker.file_marker import FileMarker
 from msgbroker.producer_consumer import Producer
+from msgbroker.spsc_queue import SPSCQueue
+
+try:
+    from lxml import etree as ET  # Optional libxml2-backed implementation of the ElementTree API
+    LXML_AVAILABLE = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    LXML_AVAILABLE = False
+
+try:
+    import orjson  # Optional C/SIMD JSON decoder
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # Optional streaming JSON parser for large files
+except ImportError:
+    ijson = None
+
+# Decode raw JSON bytes with orjson when available, otherwise with the stdlib decoder
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Value types that _flatten_dict expands into extra columns or rows
+_NESTED_TYPES = frozenset((dict, list))
+
+# libxml2 rejects very deep trees and very large text nodes unless huge_tree is set; the stdlib parser has no such limits
+_XML_PARSER_OPTIONS = {"huge_tree": True} if LXML_AVAILABLE else {}
+
+
+class _XMLRecordTarget:
+    """
+    Parser target that builds record dictionaries straight from XML parse events.
+
+    Elements below a record are collected into the same nested dict/list shape the tree-based
+    parser produced (leaf text stripped, repeated children appended as lists), without ever
+    materializing an element tree. Elements outside of records are skipped entirely.
+    """
+
+    def __init__(self, schema_tag):
+        """
+        Initialize the target.
+
+        Args:
+            schema_tag (str): Tag name of the record elements.
+        """
+        self.schema_tag = schema_tag
+        self.records = []  # Completed records, drained by the caller after each feed
+        self._depth = 0
+        self._stack = []  # (fields, text parts, record slot) of the open elements inside the current record
+        self._pending = []  # Records of the open outermost record, in document order
+
+    def start(self, tag, attrib):
+        self._depth += 1
+        # The root is never a record; anything below an open record belongs to it
+        if tag == self.schema_tag and self._depth > 1:
+            # Reserve the record's place now so a parent is emitted before the records nested in it
+            self._pending.append(None)
+            self._stack.append(({}, [], len(self._pending) - 1))
+        elif self._stack:
+            self._stack.append(({}, [], None))
+
+    def data(self, text):
+        if self._stack:
+            self._stack[-1][1].append(text)
+
+    def end(self, tag):
+        self._depth -= 1
+        if not self._stack:
+            return
+
+        fields, text_parts, slot = self._stack.pop()
+        if slot is not None:
+            # Records nested inside another record are emitted on their own as well as kept in the parent
+            self._pending[slot] = fields
+            if not self._stack:
+                self.records.extend(self._pending)
+                self._pending.clear()
+                return
+
+        parent = self._stack[-1][0]
+        # The same few tag names repeat on every record; interning lets the dicts built from them
+        # share one string object with a cached hash
+        tag = sys.intern(tag)
+        if fields:
+            # Handle nested lists correctly
+            parent.setdefault(tag, []).append(fields)
+        else:
+            text = "".join(text_parts)
+            parent[tag] = text.strip() if text else None
+
+    def close(self):
+        return None
 
 
 class FileProducer(Producer):
@@ -14,16 +112,38 @@ class FileProducer(Producer):
     Producer that reads data from files (JSON/XML) and pushes records to a queue.
     """
 
-    FILE_TYPES = {"json", "xml"}  # Supported file types
-
-    def __init__(self, global_context=None, maxsize=1000, config=None, file_path=None, file_type=None, schema_tag=None, logger=None, **kwargs):
+    __slots__ = (
+        "global_context", "queue", "_pending", "_pending_index", "_producer_done", "_eof", "config", "file_path",
+        "file_type", "schema_tag", "workers", "_xml_schema_tag_cache",
+    )
+
+    FILE_TYPES = {".json": "json", ".xml": "xml"}  # Supported file suffixes and their file types
+    SCHEMA_KEYS = {"json": "jsonSchema", "xml": "xmlSchema"}  # Config key holding the mapping per file type
+    JSON_STREAM_THRESHOLD = 16 * 1024 * 1024  # JSON files larger than this (bytes) are streamed with ijson
+    JSON_MMAP_THRESHOLD = 1024 * 1024  # JSON files at least this large (bytes) are decoded from an mmap
+    BATCH_SIZE = 256  # Records handed to the queue per put
+    POOL_QUEUE_CHUNKS = 4  # Chunks of BATCH_SIZE records each pool worker may buffer ahead
+    READ_BUFFER_SIZE = 1024 * 1024  # Read-ahead buffer for files that are streamed front to back
+    XML_READ_SIZE = 64 * 1024  # Bytes fed to the XML parser at a time
+    XML_DETECT_SAMPLE = 1000  # Root children inspected when auto-detecting the XML schema tag
+    XML_FINGERPRINT_SIZE = 16  # Leading root children identifying files that share a detected schema tag
+
+    def __init__(self, global_context=None, maxsize=1000, config=None, file_path=None, file_type=None, schema_tag=None, logger=None, workers=None, **kwargs):
         super().__init__(logger=logger, **kwargs)
         self.global_context = global_context
-        self.queue = Queue(maxsize=maxsize)
+        # One producer thread feeds one consumer thread. The queue holds batches of records, so size
+        # it in batches while still buffering roughly `maxsize` records.
+        self.queue = SPSCQueue(maxsize=max(1, -(-maxsize // self.BATCH_SIZE)))
+        self._pending = []  # Batch currently being handed out record by record by consume()
+        self._pending_index = 0
+        self._producer_done = Event()  # Set once the end-of-stream sentinel has been queued
+        self._eof = False  # Set by the consumer once it has taken the sentinel off the queue
         self.config = config
         self.file_path = file_path
         self.file_type = file_type  # Auto-detected if None
         self.schema_tag = schema_tag  # Auto-detected if None
+        self.workers = workers  # Parse directories with this many processes when > 1
+        self._xml_schema_tag_cache = {}  # Detected XML schema tags keyed by file fingerprint
         self.artifact_name = file_path
 
     def _get_files(self):
@@ -36,11 +156,13 @@ class FileProducer(Producer):
         if os.path.isfile(self.file_path):
             return [self.file_path]
         elif os.path.isdir(self.file_path):
-            return [
-                os.path.join(self.file_path, f)
-                for f in os.listdir(self.file_path)
-                if f.endswith(".json") or f.endswith(".xml")
-            ]
+            # scandir reports the entry type from the directory read itself, so no extra stat per file
+            with os.scandir(self.file_path) as entries:
+                return [
+                    entry.path
+                    for entry in entries
+                    if os.path.splitext(entry.name)[1].lower() in self.FILE_TYPES and entry.is_file()
+                ]
         else:
             raise ValueError(f"Invalid file path: {self.file_path}")
 
@@ -56,63 +178,232 @@ class FileProducer(Producer):
         if not files_to_process:
             raise ValueError(f"No valid JSON or XML files found in {self.file_path}")
 
+        jobs = []
         for file in files_to_process:
-            # Determine file type dynamically
-            file_type = "json" if file.endswith(".json") else "xml"
+            # Determine file type dynamically, defaulting to XML as before
+            file_type = self.FILE_TYPES.get(os.path.splitext(file)[1].lower(), "xml")
 
             # Retrieve the appropriate schema mapping per file
-            schema_key = "jsonSchema" if file_type == "json" else "xmlSchema"
-            key_column_mapping = self.config[schema_key]
+            jobs.append((file, file_type, self.config[self.SCHEMA_KEYS[file_type]]))
+
+        if self.workers and self.workers > 1 and len(jobs) > 1:
+            # Parse files in worker processes; results still come back in file order
+            record_sources = self._parse_files_in_pool(jobs)
+        else:
+            record_sources = (self._project_records(*job) for job in jobs)
+
+        for index, ((file, file_type, key_column_mapping), records) in enumerate(zip(jobs, record_sources)):
+            # Let the kernel start reading the next file while this one is parsed
+            if index + 1 < len(jobs):
+                self._prefetch_file(jobs[index + 1][0])
 
             context_id = str(uuid.uuid4())
             self.logger.set_context_id(context_id)
-            logging.info(
-                f"Processing file: {file} with Context ID: {self.logger.get_context_id()} and Schema: {key_column_mapping}")
-
-            # Pass metadata first
-            self.global_context.set("key_column_mapping", key_column_mapping)
-            self.global_context.set("filename", file.split("/")[-1])
-            self.global_context.set("context_id", context_id)
-            self.produce({
-                "marker": FILE_DELIMITER,
-            })
-
-            # Process and enqueue records
-            for record in self._process_file(file, file_type):
-                transformed_record = {
-                    db_column: record.get(json_key)
-                    for json_key, db_column in key_column_mapping.items()
-                }
-                self.produce(transformed_record)
-                METRICS["records_read"].inc()
+            if logging.getLogger().isEnabledFor(logging.INFO):
+                # The mapping can be large, so only format it when the message will be emitted
+                logging.info(
+                    f"Processing file: {file} with Context ID: {context_id} and Schema: {key_column_mapping}")
+
+            # Pass metadata first; the consumer applies it to the global context when it gets here
+            self.produce(FileMarker(
+                key_column_mapping=key_column_mapping,
+                filename=os.path.basename(file),
+                context_id=context_id,
+            ))
+
+            # Enqueue records in batches; the read counter moves once per batch rather than per record
+            batch = []
+            try:
+                for record in records:
+                    batch.append(record)
+                    if len(batch) >= self.BATCH_SIZE:
+                        self.produce_batch(batch)
+                        METRICS["records_read"].inc(len(batch))
+                        batch = []
+            finally:
+                if batch:
+                    self.produce_batch(batch)
+                    METRICS["records_read"].inc(len(batch))
 
         self.signal_done()
 
+    def _prefetch_file(self, file_path):
+        """
+        Asks the OS to start reading a file into the page cache in the background.
+        Does nothing on platforms without posix_fadvise.
+
+        Args:
+            file_path (str): Path to the file that will be processed next.
+        """
+        if not hasattr(os, "posix_fadvise"):
+            return
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+        except OSError:
+            return  # Opening the file for real will report the problem
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass  # Only a hint; some filesystems don't support it
+        finally:
+            os.close(fd)
+
+    def _project_records(self, file_path, file_type, key_column_mapping):
+        """
+        Parses a file and maps each flattened record onto the configured database columns.
+
+        Args:
+            file_path (str): Path to the input file.
+            file_type (str): File type ('json' or 'xml').
+            key_column_mapping (dict): Mapping of record keys to database columns.
+
+        Yields:
+            dict: Records keyed by database column.
+        """
+        # The mapping is fixed for the whole file, so materialize its pairs once instead of per record
+        column_pairs = tuple(key_column_mapping.items())
+        for record in self._process_file(file_path, file_type):
+            yield {db_column: record.get(json_key) for json_key, db_column in column_pairs}
+
+    def _parse_files_in_pool(self, jobs):
+        """
+        Parses files in a process pool, one file per worker. Workers hand records back in
+        BATCH_SIZE chunks through a small bounded queue per file, so at most POOL_QUEUE_CHUNKS
+        chunks per worker are buffered ahead of the queue however large the files are.
+
+        Args:
+            jobs (list[tuple]): (file_path, file_type, key_column_mapping) per file, in processing order.
+
+        Yields:
+            generator: Projected records of each file, in the same order as `jobs`. Each one must
+                be consumed before the next is requested.
+        """
+        with multiprocessing.Manager() as manager, ProcessPoolExecutor(max_workers=self.workers) as executor:
+            stop = manager.Event()
+            pending = deque()
+            jobs = iter(jobs)
+
+            def submit_next():
+                job = next(jobs, None)
+                if job is not None:
+                    chunks = manager.Queue(maxsize=self.POOL_QUEUE_CHUNKS)
+                    pending.append((chunks, executor.submit(
+                        _parse_file_worker, chunks, stop, self.BATCH_SIZE, self.schema_tag, *job)))
+
+            try:
+                for _ in range(self.workers):
+                    submit_next()
+                while pending:
+                    chunks, future = pending.popleft()
+                    submit_next()
+                    yield self._iter_worker_chunks(chunks, future)
+            finally:
+                # Don't start files nobody will read if we stop early, and release workers blocked on a full queue
+                stop.set()
+                for _, future in pending:
+                    future.cancel()
+
+    def _iter_worker_chunks(self, chunks, future):
+        """
+        Reads the records a pool worker sends for one file.
+
+        Args:
+            chunks: Queue the worker puts record chunks on, ended by None.
+            future (Future): The worker's task; re-raises its exception once the file is done.
+
+        Yields:
+            dict: Records keyed by database column.
+        """
+        for chunk in iter(chunks.get, None):
+            yield from chunk
+        future.result()
+
     def produce(self, record):
         """
         Adds a record to the queue.
         """
-        self.queue.put(record)
+        self.queue.put([record])
+
+    def produce_batch(self, records):
+        """
+        Adds a list of records to the queue in a single handoff.
+
+        Args:
+            records (list): Records to enqueue. The list is handed over as-is and must not be
+                            modified by the caller afterwards.
+        """
+        self.queue.put(records)
 
     def consume(self):
         """
         Retrieves a record from the queue.
+
+        Returns:
+            dict: The next record, or None once production is complete.
+        """
+        if self._pending_index >= len(self._pending):
+            if self._eof:
+                return None  # End of stream already consumed
+            records = self.queue.get()
+            if records is None:
+                self._eof = True
+                return None
+            self._pending = records
+            self._pending_index = 0
+
+        record = self._pending[self._pending_index]
+        self._pending_index += 1
+        return record
+
+    def consume_batch(self):
+        """
+        Retrieves the next batch of records from the queue.
+
+        Returns:
+            tuple: (records, eof) where `records` holds up to BATCH_SIZE records in production order
+                   and `eof` is True once no more records will follow. The final call may return
+                   records together with eof=True.
         """
-        return self.queue.get()
+        if self._pending_index < len(self._pending):
+            # Hand out whatever consume() left behind before moving to the next batch
+            records = self._pending[self._pending_index:]
+            self._pending = []
+            self._pending_index = 0
+            return records, False
+
+        if self._eof:
+            return [], True
+
+        records = self.queue.get()
+        if records is None:
+            self._eof = True
+            return [], True
+
+        # The done flag is only set after the sentinel is queued, so a single remaining item is the
+        # sentinel; take it now and report end of stream with the last batch
+        if self._producer_done.is_set() and self.queue.qsize() == 1:
+            self.queue.get()
+            self._eof = True
+            return records, True
+        return records, False
 
     def signal_done(self):
         """
-        Signals that production is complete.
+        Signals that production is complete. Safe to call more than once.
         """
+        if self._producer_done.is_set():
+            return
+        # Queue a sentinel to wake a consumer blocked on an empty queue, then publish the flag
         self.queue.put(None)
+        self._producer_done.set()
 
     def close(self):
         """
         Clears the queue and releases resources.
         """
-        while not self.queue.empty():
-            self.queue.get()
-            self.queue.task_done()
+        self.queue.clear()
+        self._pending = []
+        self._pending_index = 0
 
     def get_context_id(self):
         """
@@ -128,8 +419,8 @@ class FileProducer(Producer):
             file_path (str): Path to the input file.
             file_type (str): File type ('json' or 'xml').
 
-        Yields:
-            dict: Flattened records extracted from the file.
+        Returns:
+            Iterator[dict]: Flattened records extracted from the file.
         """
         if file_type == "json":
             parser = self._parse_json_file
@@ -138,8 +429,8 @@ class FileProducer(Producer):
         else:
             raise ValueError(f"Unsupported file type: {file_type}")
 
-        for record in parser(file_path):
-            yield record
+        # Hand back the parser's generator itself rather than re-yielding every record through this frame
+        return parser(file_path)
 
     def _detect_json_schema_tag(self, data):
         """
@@ -157,23 +448,83 @@ class FileProducer(Producer):
                     return key
         return ""  # Default to empty string if no array is found
 
-    def _detect_xml_schema_tag(self, root):
+    def _sniff_json_schema_tag(self, file_path, schema_tag=None):
+        """
+        Finds the top-level key holding the array of records by reading only as far into the file
+        as that key. Streaming counterpart of `_detect_json_schema_tag`.
+
+        Args:
+            file_path (str): Path to the JSON file.
+            schema_tag (str, optional): Configured schema tag to check instead of detecting one.
+
+        Returns:
+            str: The first top-level key holding an array (or `schema_tag`, if it holds one), or None
+                if there is no such key.
+        """
+        current_key = None
+        with open(file_path, "rb") as file:
+            for prefix, event, value in ijson.parse(file):
+                if prefix == "":
+                    if event == "map_key":
+                        current_key = value
+                    elif event == "start_array":
+                        return None  # The document itself is an array, there is no tag to find
+                elif prefix == current_key and (schema_tag is None or current_key == schema_tag):
+                    if event == "start_array":
+                        logging.info(f"Detected JSON schema tag: {current_key}")
+                        return current_key
+                    if schema_tag is not None:
+                        return None  # The configured key holds a single value, not an array
+        return None
+
+    def _detect_xml_schema_tag(self, file_path):
         """
         Detects the most likely schema tag (e.g., "Record") by finding the most common
         direct child element under the root.
 
+        Only the first XML_DETECT_SAMPLE children of the root are tallied, so detection reads
+        the head of the file instead of making a full extra pass before parsing. Files whose root
+        and first XML_FINGERPRINT_SIZE children match an earlier file reuse that file's result.
+
         Args:
-            root (xml.etree.ElementTree.Element): The root element of the XML document.
+            file_path (str): Path to the XML file.
 
         Returns:
-            str: The detected schema tag or "Record" as a fallback.
+            str: The detected schema tag or "Row" as a fallback.
         """
         tag_counts = {}
-        for child in root:
-            tag_counts[child.tag] = tag_counts.get(child.tag, 0) + 1
+        fingerprint = []  # Root tag followed by the tags of its first children
+        sampled = 0
+        root = None
+        depth = 0
+        with open(file_path, "rb") as file:
+            for event, element in ET.iterparse(file, events=("start", "end"), **_XML_PARSER_OPTIONS):
+                if event == "start":
+                    depth += 1
+                    if depth == 1:
+                        root = element
+                        fingerprint.append(element.tag)
+                    elif depth == 2:
+                        tag_counts[element.tag] = tag_counts.get(element.tag, 0) + 1
+                        if len(fingerprint) <= self.XML_FINGERPRINT_SIZE:
+                            fingerprint.append(element.tag)
+                            # Once the fingerprint is complete, stop early if a previous file matched it
+                            if len(fingerprint) > self.XML_FINGERPRINT_SIZE:
+                                cached_tag = self._xml_schema_tag_cache.get(tuple(fingerprint))
+                                if cached_tag is not None:
+                                    logging.info(f"Reusing detected XML schema tag: {cached_tag}")
+                                    return cached_tag
+                else:
+                    depth -= 1
+                    if depth == 1:
+                        root.clear()  # Drop the finished child, only its tag was needed
+                        sampled += 1
+                        if sampled >= self.XML_DETECT_SAMPLE:
+                            break
 
         # Get the most common child element under the root
         detected_tag = max(tag_counts, key=tag_counts.get, default="Row")
+        self._xml_schema_tag_cache[tuple(fingerprint)] = detected_tag
         logging.info(f"Detected XML schema tag: {detected_tag}")
         return detected_tag
 
@@ -187,46 +538,46 @@ class FileProducer(Producer):
         Args:
             data (dict): The nested dictionary to be flattened.
 
-        Returns:
-            list[dict]: A list of flattened dictionaries derived from the input data.
+        Yields:
+            dict: Flattened dictionaries derived from the input data, produced lazily so a record
+                  with many nested children never has all of its rows in memory at once.
 
         Example:
             Input: {"key1": "value1", "key2": [{"subkey1": "value2"}, {"subkey1": "value3"}]}
             Output: [{"key1": "value1", "subkey1": "value2"}, {"key1": "value1", "subkey1": "value3"}]
         """
-        # Initialize the base record, containing non-nested key-value pairs
-        base_record = {}
-        # List to store records resulting from nested elements
-        nested_records = []
+        # Flat records (the common case) are already rows; the type scan runs entirely in C
+        if _NESTED_TYPES.isdisjoint(map(type, data.values())):
+            yield data
+            return
 
-        # Iterate over the dictionary items
+        # First pass: collect non-nested key-value pairs into the base record and set nested lists aside
+        base_record = {}
+        nested_lists = []
+        # Records only ever come from the JSON decoders or the XML target, which build plain dicts and
+        # lists, so exact type checks are enough and skip isinstance()'s subclass walk
         for key, value in data.items():
-            if isinstance(value, list):
-                # If the value is a list, iterate through its elements
-                for nested in value:
-                    if isinstance(nested, dict):
-                        # Copy base record and merge with nested dictionary
-                        new_record = base_record.copy()
-                        new_record.update(nested)
-                        nested_records.append(new_record)
-            elif isinstance(value, dict):
+            value_type = type(value)
+            if value_type is list:
+                nested_lists.append(value)
+            elif value_type is dict:
                 # If the value is a dictionary, merge it with the base record
                 base_record.update(value)
             else:
                 # Add scalar values to the base record
                 base_record[key] = value
 
-        # If no nested records exist, return the base record as a single-item list
-        if not nested_records:
-            logging.debug("No nested records found; returning base record.")
-            return [base_record]
-
-        # Update each nested record with values from the base record
-        for record in nested_records:
-            record.update(base_record)
+        # Second pass: one merge per nested element, with base values taking precedence on conflicts
+        produced = False
+        for nested_list in nested_lists:
+            for nested in nested_list:
+                if type(nested) is dict:
+                    produced = True
+                    yield {**nested, **base_record}
 
-        logging.debug(f"Flattened dictionary to {len(nested_records)} records.")
-        return nested_records
+        # If no nested records exist, the base record is the only row
+        if not produced:
+            yield base_record
 
     def _parse_json_file(self, file_path):
         """
@@ -238,9 +589,24 @@ class FileProducer(Producer):
         Yields:
             dict: Flattened records extracted from the JSON file.
         """
+        # Stream large files record by record, but only when the schema tag is a top-level key holding
+        # an array; anything else goes through the whole-document path below, like smaller files
+        if ijson is not None and os.path.getsize(file_path) > self.JSON_STREAM_THRESHOLD:
+            schema_tag = self._sniff_json_schema_tag(file_path, self.schema_tag)
+            if schema_tag:
+                records = self._stream_json_file(file_path, schema_tag)
+                first = next(records, None)
+                if first is not None:
+                    yield first
+                    yield from records
+                    return
+                logging.warning(f"No records streamed from {file_path} under {schema_tag}; loading it whole")
+            else:
+                logging.warning(f"No top-level array of records found in {file_path}; loading it whole")
+
         try:
-            with open(file_path, "r") as file:
-                data = json.load(file)
+            with open(file_path, "rb") as file:
+                data = self._load_json(file)
                 logging.info(f"Successfully loaded JSON file: {file_path}")
         except (FileNotFoundError, json.JSONDecodeError) as e:
             logging.error(f"Error loading JSON file {file_path}: {e}")
@@ -258,6 +624,49 @@ class FileProducer(Producer):
         elif isinstance(records, dict):
             yield from self._flatten_dict(records)
 
+    def _load_json(self, file):
+        """
+        Decodes a whole JSON document from an open binary file.
+
+        With orjson, files of at least JSON_MMAP_THRESHOLD bytes are memory-mapped and decoded
+        straight from the page cache, skipping the intermediate bytes copy that read() would make.
+        Smaller files are read directly, where the mapping setup costs more than the copy.
+
+        Args:
+            file (BinaryIO): File opened in binary mode.
+
+        Returns:
+            The decoded JSON document.
+        """
+        if orjson is None or os.fstat(file.fileno()).st_size < self.JSON_MMAP_THRESHOLD:
+            return _json_loads(file.read())
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            with memoryview(mapped) as view:
+                return orjson.loads(view)
+
+    def _stream_json_file(self, file_path, schema_tag):
+        """
+        Streams and flattens JSON records from a file without loading the whole document.
+
+        Args:
+            file_path (str): Path to the JSON file.
+            schema_tag (str): Top-level key of the array holding the records.
+
+        Yields:
+            dict: Flattened records extracted from the JSON file.
+        """
+        logging.info(f"Streaming JSON file: {file_path} using schema tag: {schema_tag}")
+        try:
+            with open(file_path, "rb", buffering=self.READ_BUFFER_SIZE) as file:
+                for record in ijson.items(file, f"{schema_tag}.item", use_float=True):
+                    yield from self._flatten_dict(record)
+        except ijson.JSONError as e:
+            logging.error(f"Error streaming JSON file {file_path}: {e}")
+            raise
+
     def _parse_xml_file(self, file_path):
         """
         Parses and flattens XML records from a file.
@@ -269,39 +678,62 @@ class FileProducer(Producer):
             dict: Flattened records extracted from the XML file.
         """
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            logging.info(f"Successfully parsed XML file: {file_path}")
+            # Detect schema tag if not provided
+            schema_tag = self.schema_tag or self._detect_xml_schema_tag(file_path)
+            logging.info(f"Using XML schema tag: {schema_tag}")
+
+            target = _XMLRecordTarget(schema_tag)
+            parser = ET.XMLParser(target=target, **_XML_PARSER_OPTIONS)
+            with open(file_path, "rb", buffering=self.READ_BUFFER_SIZE) as file:
+                # Feed the parser incrementally and drain the records completed by each chunk
+                for chunk in iter(lambda: file.read(self.XML_READ_SIZE), b""):
+                    parser.feed(chunk)
+                    for raw_record in target.records:
+                        yield from self._flatten_dict(raw_record)
+                    target.records.clear()
+                parser.close()
+                for raw_record in target.records:
+                    yield from self._flatten_dict(raw_record)
         except (FileNotFoundError, ET.ParseError) as e:
             logging.error(f"Error loading XML file {file_path}: {e}")
             raise
 
-        # Detect schema tag if not provided
-        schema_tag = self.schema_tag or self._detect_xml_schema_tag(root)
-        logging.info(f"Using XML schema tag: {schema_tag}")
-
-        for record_element in root.findall(f".//{schema_tag}"):
-            raw_record = self._parse_xml_element(record_element)
-            yield from self._flatten_dict(raw_record)
+        logging.info(f"Successfully parsed XML file: {file_path}")
 
-    def _parse_xml_element(self, element):
-        """
-        Recursively parses an XML element into a dictionary.
 
-        Args:
-            element (xml.etree.ElementTree.Element): The XML element to parse.
-
-        Returns:
-            dict: Parsed representation of the element.
-        """
-        record = {}
-        for child in element:
-            if len(child) > 0:
-                # Handle nested lists correctly
-                if child.tag not in record:
-                    record[child.tag] = []
-                record[child.tag].append(self._parse_xml_element(child))
-            else:
-                # Add text values to the dictionary
-                record[child.tag] = child.text.strip() if child.text else None
-        return record
\ No newline at end of file
+def _parse_file_worker(chunks, stop, batch_size, schema_tag, file_path, file_type, key_column_mapping):
+    """
+    Parses a single file in a worker process and sends its records back in chunks.
+
+    Args:
+        chunks: Bounded queue the chunks are put on; None is put last, even on failure.
+        stop: Event set by the parent when it stops reading early.
+        batch_size (int): Records per chunk.
+        schema_tag (str): Schema tag of the owning producer, or None to auto-detect.
+        file_path (str): Path to the input file.
+        file_type (str): File type ('json' or 'xml').
+        key_column_mapping (dict): Mapping of record keys to database columns.
+    """
+    def send(item):
+        # Wait for room on the queue, but give up once the parent has gone away
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    producer = FileProducer(maxsize=1, schema_tag=schema_tag)
+    try:
+        chunk = []
+        for record in producer._project_records(file_path, file_type, key_column_mapping):
+            chunk.append(record)
+            if len(chunk) >= batch_size:
+                if not send(chunk):
+                    return
+                chunk = []
+        if chunk:
+            send(chunk)
+    finally:
+        send(None)
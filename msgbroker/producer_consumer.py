@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
 
 class Producer(ABC):
+    # Common fields live in slots; "__dict__" keeps the dynamic **kwargs attributes working
+    __slots__ = ("logger", "artifact_name", "ctx_id", "__dict__")
+
     def __init__(self, logger, **kwargs):
         """
         Abstract base class for producers.
@@ -31,6 +34,8 @@ class Producer(ABC):
         return self.ctx_id
 
 class Consumer(ABC):
+    __slots__ = ("producer", "artifact_name", "__dict__")
+
     def __init__(self, producer, **kwargs):
         """
                 Abstract base class for producers.
@@ -32,9 +32,9 @@ class ProducerFactory:
         Raises:
             ValueError: If the interface ID is not registered.
         """
-        if interface_id not in cls._registry:
+        producer_class = cls._registry.get(interface_id)
+        if producer_class is None:
             raise ValueError(f"Producer for interface '{interface_id}' not registered.")
 
         logging.info(f"Creating producer for interface ID '{interface_id}' with kwargs: {kwargs}")
-        producer_class = cls._registry[interface_id]
         return producer_class(*args, **kwargs)
@@ -0,0 +1,85 @@
+from collections import deque
+from threading import Event
+
+
+class SPSCQueue:
+    """
+    Bounded single-producer/single-consumer queue used to hand records from a Producer
+    thread to a Consumer thread.
+
+    Items live in a `collections.deque`, whose append/popleft are atomic on their own, so the
+    items themselves need no lock. The two events are only touched when the queue runs full or
+    empty, instead of on every put/get like `queue.Queue`.
+    """
+
+    def __init__(self, maxsize=1024):
+        """
+        Initialize the queue.
+
+        Args:
+            maxsize (int): Maximum number of items held before put() blocks.
+        """
+        self._items = deque()
+        self._maxsize = max(maxsize, 1)
+        self._not_empty = Event()
+        self._not_full = Event()
+        self._not_full.set()
+
+    def put(self, item):
+        """
+        Appends an item, blocking while the queue is full.
+
+        Args:
+            item: The item to enqueue.
+        """
+        items = self._items
+        while len(items) >= self._maxsize:
+            # Clear before re-checking so a get() racing with us cannot be missed
+            self._not_full.clear()
+            if len(items) >= self._maxsize:
+                self._not_full.wait()
+
+        items.append(item)
+        if not self._not_empty.is_set():
+            self._not_empty.set()
+
+    def get(self):
+        """
+        Removes and returns the oldest item, blocking while the queue is empty.
+
+        Returns:
+            The dequeued item.
+        """
+        items = self._items
+        while not items:
+            # Clear before re-checking so a put() racing with us cannot be missed
+            self._not_empty.clear()
+            if not items:
+                self._not_empty.wait()
+
+        item = items.popleft()
+        if not self._not_full.is_set():
+            self._not_full.set()
+        return item
+
+    def empty(self):
+        """
+        Returns True if the queue currently holds no items.
+        """
+        return not self._items
+
+    def qsize(self):
+        """
+        Returns the number of items currently in the queue.
+        """
+        return len(self._items)
+
+    def clear(self):
+        """
+        Discards all queued items at once.
+
+        Only safe once neither the producer nor the consumer is using the queue anymore.
+        """
+        self._items.clear()
+        self._not_empty.clear()
+        self._not_full.set()
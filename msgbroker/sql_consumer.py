@@ -1,38 +1,62 @@
-import datetime
 import json
 import logging
-from threading import Lock
+import time
+from operator import itemgetter
+from threading import Thread
 
-from tenacity import stop_after_attempt, retry, wait_exponential
-
-from config.config import METRICS, FILE_DELIMITER
+from config.config import METRICS
+from logger.timeutil import now_iso
+from msgbroker.file_marker import FileMarker
 from msgbroker.producer_consumer import Consumer
+from msgbroker.spsc_queue import SPSCQueue
+from transformations.transformation import Transformation
 
 
 class SQLConsumer(Consumer):
 
-    def __init__(self, global_context, transformation, logger, table_name, producer, connection_manager, key_column_mapping=None, batch_size=5):
+    COPY_MIN_ROWS = 100  # Batches of at least this many records are loaded with COPY when supported
+    WRITER_QUEUE_SIZE = 4  # Full batches allowed to wait for the database writer thread
+    BATCH_SAVEPOINT = "batch_insert"  # Savepoint guarding each batch inside the open transaction
+    LOG_SAMPLE_ROWS = 3  # Rows of a failed batch written to the job log unless DEBUG logging is on
+    INSERT_ATTEMPTS = 3  # Tries per batch when the database reports a transient error
+    RETRY_MAX_DELAY = 10  # Upper bound (seconds) of the exponential backoff between tries
+
+    def __init__(self, global_context, transformation, logger, table_name, producer, connection_manager, key_column_mapping=None, batch_size=1000, commit_every=10):
         """
         Initializes the SQLConsumer.
 
         Args:
             producer (Producer): The producer instance to consume records from.
+            transformation (Transformation | list): Transformation applied to each record, or a list
+                of transformations fused into one with Transformation.compose().
             connection_manager: Database connection manager.
             key_column_mapping (dict): Mapping of JSON keys to database column names.
             batch_size (int): Number of records to process in a single batch.
+            commit_every (int): Batches inserted between checkpoint commits. The remainder is
+                committed by finalize(); 0 or None commits only there.
         """
         super().__init__(producer)
         self.global_context = global_context
+        if isinstance(transformation, (list, tuple)):
+            transformation = Transformation.compose(transformation)
         self.transformation = transformation
         self.logger = logger
         self.table_name = table_name
         self.connection_manager = connection_manager
         self.key_column_mapping = key_column_mapping
         self.batch_size = batch_size
+        self.commit_every = commit_every
+        self._uncommitted_batches = 0  # Batches inserted since the last commit
         self.batch = []
-        self.lock = Lock()
         self.conn = self.connection_manager.connect()
+        self.cur = self.conn.cursor()  # Reused by every batch insert, closed in finalize
         self.query_builder = self.connection_manager.get_query_builder(table_name)  # Get QueryBuilder from the connection manager
+        self._query_cache = {}  # (columns, use_copy) -> (query, row getter) for the cached query builder
+        self._cached_query_builder = None
+        self._insert_queue = None  # Full batches waiting for the writer thread
+        self._writer = None
+        self._writer_error = None
+        self._pending_errors = 0  # Record errors not yet added to METRICS["errors"]
         self.error = False
 
     def consume(self):
@@ -44,36 +68,50 @@ class SQLConsumer(Consumer):
             symbol="GS2001W",
             job_name=f"Consume Records for {self.producer.artifact_name}",
             artifact_name=self.producer.artifact_name,
-            start_time=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            start_time=now_iso(),
             success=False,
             status="IN PROGRESS"
         )
 
+        transform = self.transformation.transform  # Resolved once, not per record
+        self._start_writer()
+        eof = False
         try:
-            while True:
-                record = self.producer.consume()
-                if record is None:
-                    if self.batch:
-                        self._insert_batch()
-                    break  # Signal that production is complete
-
-                # Detect metadata marker and update key-column mapping
-                if "marker" in record and record["marker"] == FILE_DELIMITER:
-                    if self.batch:
-                        self._insert_batch()  # Flush batch before schema switch
-
-                    # Update key-column mapping dynamically
-                    self.key_column_mapping = self.global_context.get("key_column_mapping")
-
-                    self.query_builder = self.connection_manager.get_query_builder(self.table_name)
-                    logging.info(
-                        f"Updated table name: {self.table_name}, New Key-Column Mapping: {self.key_column_mapping}")
-                    continue  # Skip processing the metadata record
-
-                # Append record to batch
-                self.batch.append(self.transformation.transform(record))
-                if len(self.batch) >= self.batch_size:
-                    self._insert_batch()
+            try:
+                while not eof:
+                    records, eof = self.producer.consume_batch()
+                    for record in records:
+                        # Detect metadata marker and update key-column mapping
+                        if record.__class__ is FileMarker:
+                            if self.batch:
+                                self._submit_batch()  # Flush batch before schema switch
+
+                            record.apply(self.global_context)
+
+                            # Update key-column mapping dynamically
+                            self.key_column_mapping = self.global_context.get("key_column_mapping")
+
+                            self.query_builder = self.connection_manager.get_query_builder(self.table_name)
+                            self.transformation.refresh()  # Pick up the new file's context
+                            logging.info(
+                                f"Updated table name: {self.table_name}, New Key-Column Mapping: {self.key_column_mapping}")
+                            continue  # Skip processing the metadata record
+
+                        # Append record to batch
+                        self.batch.append(transform(record))
+                        if len(self.batch) >= self.batch_size:
+                            self._submit_batch()
+            finally:
+                # Insert any remaining records in the batch, then wait for the writer to finish
+                if self.batch and self._writer_error is None:
+                    self._submit_batch()
+                self._stop_writer()
+                if not eof:
+                    # Stopped early on an error; keep the producer from blocking on a full queue
+                    self._discard_remaining()
+
+            if self._writer_error is not None:
+                raise self._writer_error
 
         except Exception as e:
             self.logger.log_job(
@@ -81,7 +119,7 @@ class SQLConsumer(Consumer):
                 job_name=f"Consume Records for {self.producer.artifact_name}",
                 artifact_name=self.producer.artifact_name,
                 error_message=str(e),
-                end_time=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                end_time=now_iso(),
                 job_id=job_id,
                 success=False,
                 status="ERROR"
@@ -91,10 +129,6 @@ class SQLConsumer(Consumer):
             self.error = True
 
         finally:
-            # Insert any remaining records in the batch
-            if self.batch:
-                self._insert_batch()
-
             # Mark the job as completed
             self.logger.log_job(
                 symbol="GS2001W",
@@ -102,10 +136,88 @@ class SQLConsumer(Consumer):
                 artifact_name=self.producer.artifact_name,
                 job_id=job_id,
                 success=not self.error,
-                end_time=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                end_time=now_iso(),
                 status="COMPLETED"
             )
 
+    def _discard_remaining(self):
+        """
+        Reads and drops everything the producer still sends until it signals the end of the stream.
+        """
+        discarded = 0
+        eof = False
+        while not eof:
+            records, eof = self.producer.consume_batch()
+            discarded += len(records)
+        logging.warning(f"SQLConsumer discarded {discarded} queued records after an error")
+
+    @property
+    def key_column_mapping(self):
+        return self._key_column_mapping
+
+    @key_column_mapping.setter
+    def key_column_mapping(self, mapping):
+        # Snapshot the pairs once per mapping, so process_record skips the .items() view per record
+        self._key_column_mapping = mapping
+        self._mapping_pairs = tuple(mapping.items()) if mapping is not None else None
+
+    def _start_writer(self):
+        """
+        Starts the thread that inserts finished batches, so parsing and transforming the next
+        batch overlaps with the database round trip of the previous one.
+        """
+        self._insert_queue = SPSCQueue(maxsize=self.WRITER_QUEUE_SIZE)
+        self._writer_error = None
+        self._writer = Thread(target=self._db_writer_loop, name="sql-consumer-writer", daemon=True)
+        self._writer.start()
+
+    def _submit_batch(self):
+        """
+        Hands the current batch to the writer thread and starts a new one.
+
+        Raises:
+            Exception: The error that stopped the writer thread, if an earlier batch failed.
+        """
+        if self._writer_error is not None:
+            raise self._writer_error
+        self._flush_error_count()
+        # The query builder travels with the batch since the next file's marker may replace it
+        self._insert_queue.put((self.batch, self.query_builder))
+        self.batch = []
+
+    def _flush_error_count(self):
+        """
+        Adds the record errors counted since the last flush to the errors metric.
+        """
+        if self._pending_errors:
+            METRICS["errors"].inc(self._pending_errors)
+            self._pending_errors = 0
+
+    def _stop_writer(self):
+        """
+        Signals the writer thread that no more batches will follow and waits for it to finish.
+        """
+        self._insert_queue.put(None)
+        self._writer.join()
+
+    def _db_writer_loop(self):
+        """
+        Inserts queued batches until the end-of-stream sentinel arrives. After a failure the
+        remaining batches are discarded so the consumer is never blocked on a full queue.
+        """
+        while True:
+            item = self._insert_queue.get()
+            if item is None:
+                return
+            if self._writer_error is not None:
+                continue
+
+            batch, query_builder = item
+            try:
+                self._insert_batch(batch, query_builder)
+            except Exception as e:
+                self._writer_error = e
+
     def process_record(self, record):
         """
         Transforms and adds a record to the batch.
@@ -113,53 +225,48 @@ class SQLConsumer(Consumer):
         Args:
             record (dict): Record to process.
         """
+        # Successful records are only logged per batch in _insert_batch; a job entry per record
+        # would cost a logger write for every row read
         try:
-            job_id = self.logger.log_job(
-                symbol="GS2001W",
-                job_name="Transform Record",
-                start_time=datetime.datetime.now(datetime.timezone.utc).isoformat(),
-                artifact_name=self.producer.artifact_name,
-                status="IN PROGRESS",
-            )
-            transformed_record = {
-                db_column: record.get(json_key)
-                for json_key, db_column in self.key_column_mapping.items()
-            }
+            transformed_record = {db_column: record.get(json_key) for json_key, db_column in self._mapping_pairs}
             transformed_record["processed"] = False
-            with self.lock:
-                self.batch.append(transformed_record)
-
-            self.logger.log_job(
-                symbol="GS2001W",
-                job_name="Transform Record",
-                end_time=datetime.datetime.now(datetime.timezone.utc).isoformat(),
-                artifact_name=self.producer.artifact_name,
-                job_id=job_id,
-                success=True,
-                status="SUCCESS",
-            )
+            # Only the consumer thread touches the batch, so no lock is needed
+            self.batch.append(transformed_record)
         except Exception as e:
             self.logger.log_job(
                 symbol="GS2001W",
                 job_name="Transform Record",
-                end_time=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                end_time=now_iso(),
                 artifact_name=self.producer.artifact_name,
                 error_message=str(e),
-                job_id=job_id,
                 success=False,
                 status="ERROR"
             )
             logging.error(f"Error processing record: {e}")
-            METRICS["errors"].inc()
+            # Counted locally and added to the metric once per batch, not once per bad record
+            self._pending_errors += 1
 
     @METRICS["batch_insert_time"].time()
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=10))
-    def _insert_batch(self):
+    def _insert_batch(self, batch=None, query_builder=None):
         """
-        Inserts the current batch of records into the database.
+        Inserts a batch of records into the database.
+
+        Transient database errors (see the connection manager's `transient_errors`) are retried
+        up to INSERT_ATTEMPTS times with exponential backoff; any other error fails the batch at once.
+
+        Args:
+            batch (list): Records to insert. Defaults to the consumer's current batch.
+            query_builder (QueryBuilder): Query builder for the batch's table. Defaults to the current one.
         """
+        if batch is None:
+            batch = self.batch
+        if query_builder is None:
+            query_builder = self.query_builder
+
+        query, values = None, []
+        savepoint_set = False
         try:
-            if not self.batch:
+            if not batch:
                 job_id = self.logger.log_job(
                     symbol="GS2001W",
                     job_name=f"Batch Insert for {self.producer.artifact_name}",
@@ -167,7 +274,7 @@ class SQLConsumer(Consumer):
                     success=False,
                     error_message="No records to insert.",
                     status="WARNING",
-                    start_time=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    start_time=now_iso(),
                 )
                 logging.warning("Insert batch called with no records to process.")
                 return
@@ -177,38 +284,80 @@ class SQLConsumer(Consumer):
                 job_name=f"Batch Insert for {self.producer.artifact_name}",
                 artifact_name=self.producer.artifact_name,
                 status="IN PROGRESS",
-                start_time=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                start_time=now_iso(),
             )
 
-            columns = self.batch[0].keys()
-            query = self.query_builder.build_insert_query(columns)
-            values = [[record[col] for col in columns] for record in self.batch]
+            # Only the columns the records carry are sent. Records from consume() have no `processed`
+            # key (only process_record sets it), so that column takes its table default (FALSE)
+            columns = tuple(batch[0].keys())
+            # Large batches are bulk-loaded with COPY where the database supports it
+            use_copy = self.connection_manager.supports_copy and len(batch) >= self.COPY_MIN_ROWS
 
-            try:
-                self.connection_manager.execute_batch_insert(self.conn, query, values)
+            # Every batch of a file has the same columns, so build the query and row getter once
+            if query_builder is not self._cached_query_builder:
+                self._query_cache.clear()
+                self._cached_query_builder = query_builder
+            cached = self._query_cache.get((columns, use_copy))
+            if cached is None:
+                if use_copy:
+                    query = query_builder.build_copy_query(columns)
+                else:
+                    query = query_builder.build_insert_query(columns)
+                # itemgetter pulls every column of a record in one C call
+                cached = self._query_cache[(columns, use_copy)] = (query, itemgetter(*columns))
+            query, row_getter = cached
 
-            finally:
-                logging.info(f"Successfully inserted batch of {len(self.batch)} records into {self.table_name}.")
+            # With a single column itemgetter returns the bare value, so wrap it to keep one tuple per row
+            if len(columns) == 1:
+                values = [(row_getter(record),) for record in batch]
+            else:
+                values = list(map(row_getter, batch))
 
-                self.logger.log_job(
-                    query=query,
-                    values=json.dumps(values),
-                    symbol="GS2001W",
-                    job_name=f"Batch Insert for {self.producer.artifact_name}",
-                    artifact_name=self.producer.artifact_name,
-                    job_id=job_id,
-                    success=True,
-                    status="SUCCESS",
-                    end_time=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            # Batches share one transaction; the savepoint lets a failed attempt be undone on its own
+            for attempt in range(1, self.INSERT_ATTEMPTS + 1):
+                try:
+                    self._ensure_cursor()
+                    self.connection_manager.savepoint(self.cur, self.BATCH_SAVEPOINT)
+                    savepoint_set = True
+                    if use_copy:
+                        self.connection_manager.execute_batch_copy(self.conn, query, values, cursor=self.cur, commit=False)
+                    else:
+                        self.connection_manager.execute_batch_insert(self.conn, query, values, cursor=self.cur, commit=False)
+                    self.connection_manager.release_savepoint(self.cur, self.BATCH_SAVEPOINT)
+                    break
+                except self.connection_manager.transient_errors as e:
+                    if attempt == self.INSERT_ATTEMPTS:
+                        raise
+                    if savepoint_set:
+                        savepoint_set = False
+                        self.connection_manager.rollback_to_savepoint(self.cur, self.BATCH_SAVEPOINT)
+                    delay = min(2 ** (attempt - 1), self.RETRY_MAX_DELAY)  # 1s, 2s, ... as tenacity waited
+                    logging.warning(
+                        f"Transient error inserting batch into {self.table_name} "
+                        f"(attempt {attempt} of {self.INSERT_ATTEMPTS}), retrying in {delay}s: {e}")
+                    time.sleep(delay)
 
-                )
-                METRICS["records_processed"].inc(len(self.batch))
-                self.batch.clear()
+            self._checkpoint()
+            logging.info(f"Successfully inserted batch of {len(batch)} records into {self.table_name}.")
+
+            self.logger.log_job(
+                query=query,
+                symbol="GS2001W",
+                job_name=f"Batch Insert for {self.producer.artifact_name}",
+                artifact_name=self.producer.artifact_name,
+                job_id=job_id,
+                success=True,
+                status="SUCCESS",
+                end_time=now_iso(),
+
+            )
+            METRICS["records_processed"].inc(len(batch))
+            batch.clear()
 
         except Exception as e:
             self.logger.log_job(
                 query=query,
-                values=json.dumps(values),
+                values=self._values_for_log(values),
                 symbol="GS2001W",
                 job_name=f"Batch Insert for {self.producer.artifact_name}",
                 artifact_name=self.producer.artifact_name,
@@ -216,19 +365,58 @@ class SQLConsumer(Consumer):
                 success=False,
                 error_message=str(e),
                 status="ERROR",
-                end_time = datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                end_time = now_iso(),
 
             )
-            logging.error(f"Failed to insert batch: {e}")
-            self.conn.rollback()
+            logging.error(f"Failed to insert batch of {len(values)} records: {e}")
+            if savepoint_set:
+                self.connection_manager.rollback_to_savepoint(self.cur, self.BATCH_SAVEPOINT)
+            else:
+                self.conn.rollback()
             METRICS["errors"].inc()
             self.error = True
             raise
 
+    def _values_for_log(self, values):
+        """
+        Serializes the values of a failed batch for the job log.
+
+        Args:
+            values (list): Row tuples of the batch.
+
+        Returns:
+            str: JSON of every row when DEBUG logging is enabled, otherwise of the first
+                 LOG_SAMPLE_ROWS rows, so a large batch is not serialized in full.
+        """
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            return json.dumps(values)
+        return json.dumps(values[:self.LOG_SAMPLE_ROWS])
+
+    def _ensure_cursor(self):
+        """
+        Reopens the shared cursor if it has been closed, e.g. by a failed statement or a driver
+        reset, so a retried batch does not fail on a dead cursor. The connection itself is not
+        replaced: a new connection would silently drop the batches still waiting to be committed.
+        """
+        if getattr(self.cur, "closed", False):
+            logging.warning(f"Cursor for {self.table_name} was closed; opening a new one.")
+            self.cur = self.conn.cursor()
+
+    def _checkpoint(self):
+        """
+        Counts an inserted batch and commits once `commit_every` batches are pending, bounding
+        the work lost to a crash without paying a commit (and WAL flush) per batch.
+        """
+        self._uncommitted_batches += 1
+        if self.commit_every and self._uncommitted_batches >= self.commit_every:
+            self.conn.commit()
+            self._uncommitted_batches = 0
+
     def finalize(self):
         """
         Finalizes the consumer's operations, committing or rolling back transactions.
         """
+        self._flush_error_count()
         try:
             if self.error:
                 self.conn.rollback()
@@ -239,7 +427,7 @@ class SQLConsumer(Consumer):
                     success=False,
                     error_message="Rollback due to errors encountered.",
                     status="ERROR",
-                    end_time=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    end_time=now_iso(),
 
                 )
                 logging.error(f"Finalizing consumer for {self.producer.artifact_name} with rollback due to errors.")
@@ -251,7 +439,7 @@ class SQLConsumer(Consumer):
                     artifact_name=self.producer.artifact_name,
                     success=True,
                     status="SUCCESS",
-                    end_time=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    end_time=now_iso(),
 
                 )
                 logging.info(f"Finalizing consumer for {self.producer.artifact_name} with commit.")
@@ -263,11 +451,12 @@ class SQLConsumer(Consumer):
                 success=False,
                 error_message=str(e),
                 status="ERROR",
-                end_time = datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                end_time = now_iso(),
 
             )
             logging.error(f"Error finalizing consumer for {self.producer.artifact_name}: {e}")
             METRICS["errors"].inc()
         finally:
+            self.cur.close()
             self.conn.close()
             logging.info(f"Database connection closed for consumer of {self.producer.artifact_name}.")
\ No newline at end of file
@@ -0,0 +1,72 @@
+import json
+import os
+import tempfile
+import unittest
+
+from msgbroker import file_producer
+from msgbroker.file_producer import FileProducer
+
+
+@unittest.skipIf(file_producer.ijson is None, "ijson is not installed")
+class FileProducerJsonStreamingTest(unittest.TestCase):
+    """
+    Files over JSON_STREAM_THRESHOLD are streamed with ijson; they must yield the same
+    records as the whole-document path.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def _write(self, data):
+        path = os.path.join(self.tmpdir.name, "records.json")
+        with open(path, "w") as file:
+            json.dump(data, file)
+        return path
+
+    def _parse(self, path, schema_tag, threshold):
+        producer = FileProducer(maxsize=1, schema_tag=schema_tag)
+        producer.JSON_STREAM_THRESHOLD = threshold
+        return list(producer._parse_json_file(path))
+
+    def _assert_same_as_in_memory(self, data, schema_tag):
+        path = self._write(data)
+        expected = self._parse(path, schema_tag, threshold=float("inf"))
+        self.assertEqual(self._parse(path, schema_tag, threshold=0), expected)
+        return expected
+
+    def test_streams_detected_array(self):
+        records = self._assert_same_as_in_memory({"meta": 1, "items": [{"a": "1"}, {"a": "2"}]}, None)
+        self.assertEqual(records, [{"a": "1"}, {"a": "2"}])
+
+    def test_configured_tag_missing_falls_back_to_whole_document(self):
+        records = self._assert_same_as_in_memory({"items": [{"a": "1"}, {"a": "2"}]}, "records")
+        self.assertEqual(len(records), 2)
+
+    def test_configured_tag_not_an_array_falls_back_to_whole_document(self):
+        records = self._assert_same_as_in_memory({"records": {"a": "1"}, "items": [{"a": "2"}]}, "records")
+        self.assertEqual(records, [{"a": "1"}])
+
+
+class FileProducerEndOfStreamTest(unittest.TestCase):
+    """
+    Once the consumer has taken the end-of-stream sentinel, further calls return at once,
+    even if the producer has not yet published its done flag.
+    """
+
+    def setUp(self):
+        self.producer = FileProducer(maxsize=1)
+        # The window inside signal_done: sentinel queued, done flag not yet set
+        self.producer.queue.put(None)
+
+    def test_consume_keeps_returning_none(self):
+        self.assertIsNone(self.producer.consume())
+        self.assertIsNone(self.producer.consume())
+
+    def test_consume_batch_keeps_reporting_eof(self):
+        self.assertEqual(self.producer.consume_batch(), ([], True))
+        self.assertEqual(self.producer.consume_batch(), ([], True))
+
+
+if __name__ == "__main__":
+    unittest.main()
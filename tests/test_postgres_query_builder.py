@@ -0,0 +1,30 @@
+import unittest
+
+from db.postgres_query_builder import PostgresQueryBuilder
+
+
+class PostgresQueryBuilderInsertTest(unittest.TestCase):
+    """
+    execute_values expands a single `VALUES %s` placeholder into every row of the batch,
+    so the batch INSERT must keep exactly one placeholder after VALUES.
+    """
+
+    def setUp(self):
+        self.builder = PostgresQueryBuilder("SFLW_RECS")
+
+    def test_batch_insert_has_single_values_placeholder(self):
+        query = self.builder.build_insert_query(["USER_ID", "FNUMBER", "SCAN_TIME"], batch=True)
+
+        self.assertTrue(query.startswith('INSERT INTO SFLW_RECS ("user_id", "fnumber", "scan_time") VALUES %s'))
+        self.assertEqual(query.count("%s"), 1)
+        # RETURNING id follows the placeholder; everything before it must end in VALUES %s
+        self.assertTrue(query.split(" RETURNING ")[0].endswith("VALUES %s"))
+
+    def test_single_insert_has_one_placeholder_per_column(self):
+        query = self.builder.build_insert_query(["USER_ID", "FNUMBER"], batch=False)
+
+        self.assertIn("VALUES (%s, %s)", query)
+
+
+if __name__ == "__main__":
+    unittest.main()
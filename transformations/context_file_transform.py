@@ -5,8 +5,17 @@ class ContextFileTransform(Transformation):
     def __init__(self, global_context=None):
         super().__init__(global_context)
         self.global_context = global_context
+        self._context_id = None
+        self._filename = None
+        self.refresh()
+
+    def refresh(self):
+        # The context only changes between files, so read it once per file instead of once per record
+        if self.global_context is not None:
+            self._context_id = self.global_context.get('context_id')
+            self._filename = self.global_context.get('filename')
 
     def transform(self, record):
-        record['context_id'] = self.global_context.get('context_id')
-        record['filename'] = self.global_context.get('filename')
+        record['context_id'] = self._context_id
+        record['filename'] = self._filename
         return record
\ No newline at end of file
@@ -10,3 +10,36 @@ class Transformation(ABC):
     def transform(self, record):
         """Transforms the record into the correct format or add fields, etc..."""
         pass
+
+    def refresh(self):
+        """Re-reads any values cached from the global context; called by consumers when a new file starts"""
+        pass
+
+    @staticmethod
+    def compose(transformations):
+        """Fuses transformations applied in order into a single one, built once instead of dispatched per record"""
+        transformations = list(transformations)
+        if not transformations:
+            raise ValueError("compose requires at least one transformation.")
+        if len(transformations) == 1:
+            return transformations[0]
+        return _ComposedTransformation(transformations)
+
+
+class _ComposedTransformation(Transformation):
+    """Applies several transformations in order as one"""
+
+    def __init__(self, transformations):
+        super().__init__(transformations[0].global_context)
+        self.transformations = tuple(transformations)
+        # Bound methods resolved once, so each record skips the attribute lookups
+        self._steps = tuple(transformation.transform for transformation in self.transformations)
+
+    def transform(self, record):
+        for step in self._steps:
+            record = step(record)
+        return record
+
+    def refresh(self):
+        for transformation in self.transformations:
+            transformation.refresh()